@@ -1,18 +1,55 @@
 import asyncio
-from dataclasses import dataclass
+import functools
+import hashlib
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, Tuple
-from xrpl.asyncio.clients import AsyncJsonRpcClient
+from decimal import Decimal
+from typing import Any, ClassVar, Dict, Optional, Tuple
+import httpx
+import orjson
+from xrpl.asyncio.clients import AsyncJsonRpcClient, AsyncWebsocketClient
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
 from xrpl.asyncio.wallet import generate_faucet_wallet
 from xrpl.wallet import Wallet
-from xrpl.models.requests import AccountInfo, AccountLines, ServerState
+from xrpl.models.requests import (
+    AccountInfo,
+    AccountLines,
+    AccountOffers,
+    AccountTx,
+    GenericRequest,
+    Subscribe,
+    Tx,
+)
 from xrpl.models.transactions import Payment, TrustSet, OfferCreate, EscrowCreate, EscrowFinish
-from xrpl.asyncio.transaction import submit_and_wait
+from xrpl.asyncio.ledger import get_latest_validated_ledger_sequence
+from xrpl.asyncio.transaction import autofill, submit, submit_and_wait
+from xrpl.transaction import sign
 from xrpl.utils import xrp_to_drops, datetime_to_ripple_time
-from cryptoconditions import PreimageSha256
 import os
 
 
+# TokenEscrow amendment ID (XLS-85). If your server returns only IDs, this works.
+# If your server returns names differently, you may need to print amendments to confirm.
+TOKEN_ESCROW_ID = "138B968F25822EFBF54C00F97031221C47B1EAB8321D93C7C2AEAF85F04EC5DF"
+
+# Batch amendment ID (XLS-56). Amendment IDs are SHA512-half of the name,
+# so this is sha512("Batch")[:32] — same derivation as TOKEN_ESCROW_ID.
+BATCH_ID = "894646DD5284E97DECFE6674A6D6152686791C4A95F8C132CCA9BAF9E5812FB6"
+
+# XLS-56 Batch flags.
+TF_ALL_OR_NOTHING = 0x00010000
+TF_INDEPENDENT = 0x00080000
+
+# Amendments change on the order of months; caching the answer for a few
+# minutes is safe and keeps feature lookups off the per-escrow hot path.
+AMENDMENTS_CACHE_TTL = 300.0
+
+# Trustline snapshots stay valid for well under a ledger close; a short TTL
+# lets a multi-step flow (check + send + re-check) reuse one AccountLines
+# response without ever serving a stale post-write read — writes invalidate.
+TRUSTLINE_CACHE_TTL = 2.0
+
 # -------------------------
 # Time helpers (always UTC)
 # -------------------------
@@ -20,88 +57,719 @@ import os
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
+# Ripple epoch (2000-01-01T00:00Z) as a Unix timestamp.
+_RIPPLE_EPOCH_OFFSET = 946684800
+
 def to_ripple_time(dt: datetime) -> int:
+    # Everything in this codebase passes now_utc()-derived datetimes, so
+    # skip the astimezone() round trip when the value is already UTC.
+    if dt.tzinfo is timezone.utc:
+        return int(dt.timestamp()) - _RIPPLE_EPOCH_OFFSET
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return datetime_to_ripple_time(dt.astimezone(timezone.utc))
 
+@functools.lru_cache(maxsize=1024)
+def _xrp_to_drops(amount_xrp: float) -> str:
+    """
+    Memoized xrp_to_drops, with in-range whole-XRP amounts (the dominant
+    case in payment scripts) converted by integer arithmetic instead of
+    the library's Decimal construction. Anything negative or above the
+    100B XRP supply cap falls through so xrp_to_drops raises its usual
+    XRPRangeException instead of this path signing a bad amount.
+    """
+    if (isinstance(amount_xrp, int) or (isinstance(amount_xrp, float) and amount_xrp.is_integer())) \
+            and 0 <= amount_xrp <= 10**11:
+        return str(int(amount_xrp) * 1_000_000)
+    return xrp_to_drops(amount_xrp)
+
+
+@functools.lru_cache(maxsize=4096)
+def _dec(value: str) -> Decimal:
+    """
+    Memoized str -> Decimal. Trustline limits and common amounts repeat
+    constantly across checks, and Decimal's string lexer is the hot part.
+    """
+    return Decimal(value)
+
+
+# -------------------------
+# Memoized transaction builders
+# -------------------------
+# xrpl-py transaction models are immutable and validate every field on
+# construction (address checksums, amount shape, type checks). Memoizing
+# the builders means a repeated identical transfer — bulk issuance of the
+# same amount, re-setting the same trustline — pays that validation once.
+# Sharing the model is safe: autofill and signing copy it, never mutate it.
+
+@functools.lru_cache(maxsize=1024)
+def _xrp_payment_tx(account: str, destination: str, drops: str) -> Payment:
+    return Payment(account=account, destination=destination, amount=drops)
+
+
+@functools.lru_cache(maxsize=1024)
+def _iou_payment_tx(account: str, destination: str,
+                    currency: str, issuer: str, value: str) -> Payment:
+    return Payment(
+        account=account,
+        destination=destination,
+        amount={"currency": currency, "issuer": issuer, "value": value},
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _trust_set_tx(account: str, currency: str, issuer: str, limit: str) -> TrustSet:
+    return TrustSet(
+        account=account,
+        limit_amount={"currency": currency, "issuer": issuer, "value": limit},
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _offer_create_tx(account: str,
+                     gets_currency: str, gets_issuer: str, gets_value: str,
+                     pays_currency: str, pays_issuer: str, pays_value: str) -> OfferCreate:
+    return OfferCreate(
+        account=account,
+        taker_gets={"currency": gets_currency, "issuer": gets_issuer, "value": gets_value},
+        taker_pays={"currency": pays_currency, "issuer": pays_issuer, "value": pays_value},
+    )
+
+
+# PreimageSha256 DER framing for a 32-byte preimage is fixed-shape:
+#   condition   = A0 25 80 20 <sha256(preimage)> 81 01 20
+#   fulfillment = A0 22 80 20 <preimage>
+# (type tag, total length, hash/preimage field, and for the condition the
+# cost field — always 0x20 = 32 for a 32-byte preimage.)
+_CONDITION_PREFIX = b"\xa0\x25\x80\x20"
+_CONDITION_SUFFIX = b"\x81\x01\x20"
+_FULFILLMENT_PREFIX = b"\xa0\x22\x80\x20"
+
+
+def _preimage_sha256(preimage: bytes) -> Tuple[str, str]:
+    """
+    DER-framed PreimageSha256 condition and fulfillment for a 32-byte
+    preimage (the frame lengths above are hardcoded for that size).
+    rippled parses the hex fields case-insensitively, so lowercase is fine.
+    """
+    condition = _CONDITION_PREFIX + hashlib.sha256(preimage).digest() + _CONDITION_SUFFIX
+    fulfillment = _FULFILLMENT_PREFIX + preimage
+    return condition.hex(), fulfillment.hex()
+
+
 def make_condition_and_fulfillment() -> Tuple[str, str]:
     """
-    Proper XRPL condition & fulfillment using PreimageSha256.
+    XRPL crypto-condition & fulfillment (PreimageSha256) for a fresh
+    random preimage.
+    """
+    return _preimage_sha256(os.urandom(32))
+
+
+def make_conditions_batch(count: int) -> list:
+    """
+    Generates `count` condition/fulfillment pairs from one os.urandom read,
+    for bulk escrow issuance (one condition per HTLC leg or recipient).
+    Amortizes the entropy syscall; the hashing itself already runs inside
+    OpenSSL, so the loop is just slicing and framing.
+    """
+    blob = os.urandom(32 * count)
+    return [_preimage_sha256(blob[i * 32:(i + 1) * 32]) for i in range(count)]
+
+
+async def make_conditions_batch_offloaded(count: int) -> list:
+    """
+    make_conditions_batch on a worker thread, for large batches generated
+    while the event loop is busy with RPCs — OpenSSL releases the GIL
+    during hashing, so other coroutines keep making progress.
+    """
+    return await asyncio.to_thread(make_conditions_batch, count)
+
+
+# -------------------------
+# HTTP client
+# -------------------------
+
+class CompressedAsyncJsonRpcClient(AsyncJsonRpcClient):
+    """
+    AsyncJsonRpcClient with one persistent httpx session that negotiates
+    gzip/deflate. account_lines for fat accounts and server_state (full
+    amendment list) are the big responses — compressed they're a fraction
+    of the bytes, and the connection stays warm between calls.
+    """
+
+    def __init__(self, url: str) -> None:
+        super().__init__(url)
+        # One pool shared by every XRPAccount holding this client: keep-alive
+        # connections outlive individual requests, so only the first RPC pays
+        # the TCP+TLS handshake. http2 needs the httpx[http2] extra.
+        # limits= must go to the transport: AsyncClient ignores its own
+        # limits argument whenever an explicit transport is supplied.
+        self._http = httpx.AsyncClient(
+            headers={"Accept-Encoding": "gzip, deflate"},
+            timeout=httpx.Timeout(10.0),
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=60,
+                ),
+            ),
+        )
+
+    async def _post(self, payload) -> Any:
+        # orjson on both sides: encode the request and decode the (possibly
+        # very large) response with the C parser instead of stdlib json.
+        response = await self._http.post(
+            self.url,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+        return orjson.loads(response.content)
+
+    async def _request_impl(self, request, *args, **kwargs):
+        return json_to_response(await self._post(request_to_json_rpc(request)))
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def batch_request(self, requests: list) -> list:
+        """
+        Sends several read requests as one JSON-RPC batch POST and returns
+        the responses in request order. Responses are demuxed by id — the
+        server is free to answer out of order.
+        """
+        framed = []
+        for i, req in enumerate(requests):
+            body = request_to_json_rpc(req)
+            body["id"] = i
+            framed.append(body)
+        raw = await self._post(framed)
+        if isinstance(raw, dict):
+            if len(framed) == 1:
+                return [json_to_response(raw)]
+            # Server answered unbatched — rippled's HTTP endpoint doesn't
+            # accept JSON-RPC arrays, so against stock nodes this is the
+            # normal case, not the edge case. Degrade to one pooled POST
+            # per request so callers still get their N responses.
+            singles = await asyncio.gather(
+                *(self._post(request_to_json_rpc(req)) for req in requests)
+            )
+            return [json_to_response(item) for item in singles]
+        by_id = {item.get("id"): item for item in raw}
+        return [json_to_response(by_id[i]) for i in range(len(framed))]
+
+
+class BatchingAsyncJsonRpcClient(CompressedAsyncJsonRpcClient):
+    """
+    Client that coalesces requests awaited concurrently into one batch
+    POST. Each request() parks a future and schedules a flush for the next
+    event-loop tick; everything gathered in the same tick — e.g. several
+    accounts' balance checks — goes out as a single JSON-RPC array and is
+    demuxed back by id. Call sites don't change: any XRPAccount code run
+    under asyncio.gather batches automatically.
+
+    A non-zero batch_window widens the net: the flush is deferred that many
+    seconds after the first request, letting near-simultaneous (but not
+    same-tick) callers coalesce too, at the cost of adding that much
+    latency to the first request in each batch.
+    """
+
+    def __init__(self, url: str, max_batch: int = 20, batch_window: float = 0.0) -> None:
+        super().__init__(url)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._pending: list = []  # [(request, future), ...]
+        self._flush_scheduled = False
+
+    async def _request_impl(self, request, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((request, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            if self.batch_window > 0.0:
+                loop.call_later(self.batch_window, self._start_flush)
+            else:
+                loop.call_soon(self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch):
+            asyncio.ensure_future(self._flush(pending[start:start + self.max_batch]))
+
+    async def _flush(self, pending: list) -> None:
+        if len(pending) == 1:
+            request, future = pending[0]
+            try:
+                response = await super()._request_impl(request)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(response)
+            return
+        try:
+            responses = await self.batch_request([request for request, _ in pending])
+        except Exception as exc:
+            # Transport-level failure fails the whole batch; per-request
+            # rippled errors still come back as individual responses.
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), response in zip(pending, responses):
+            if not future.done():
+                future.set_result(response)
+        if len(responses) < len(pending):
+            # A short reply must not leave the unmatched callers awaiting
+            # forever; fail them loudly so they can retry or surface it.
+            exc = RuntimeError(
+                f"JSON-RPC batch returned {len(responses)} responses "
+                f"for {len(pending)} requests"
+            )
+            for _, future in pending[len(responses):]:
+                if not future.done():
+                    future.set_exception(exc)
+
+
+class WalletPool:
+    """
+    Disk-persisted pool of pre-funded testnet wallets. Faucet funding costs
+    ~10 seconds per wallet, so dev/test loops that release their wallets
+    back on exit skip the faucet entirely on later runs. The pool file
+    holds seeds only and is locked around each read-modify-write so
+    parallel runs don't hand out the same wallet twice.
+    """
+
+    PATH = os.path.expanduser("~/.xrpl_test_wallets.json")
+
+    @classmethod
+    def _pop_seed(cls) -> Optional[str]:
+        import fcntl
+        try:
+            with open(cls.PATH, "rb+") as pool_file:
+                fcntl.flock(pool_file, fcntl.LOCK_EX)
+                try:
+                    raw = pool_file.read()
+                    seeds = orjson.loads(raw) if raw else []
+                    if not seeds:
+                        return None
+                    seed = seeds.pop()
+                    pool_file.seek(0)
+                    pool_file.truncate()
+                    pool_file.write(orjson.dumps(seeds))
+                    return seed
+                finally:
+                    fcntl.flock(pool_file, fcntl.LOCK_UN)
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def release(cls, wallet: Wallet) -> None:
+        """Returns a still-funded wallet to the pool for the next run."""
+        import fcntl
+        with open(cls.PATH, "ab+") as pool_file:
+            fcntl.flock(pool_file, fcntl.LOCK_EX)
+            try:
+                pool_file.seek(0)
+                raw = pool_file.read()
+                seeds = orjson.loads(raw) if raw else []
+                seeds.append(wallet.seed)
+                pool_file.seek(0)
+                pool_file.truncate()
+                pool_file.write(orjson.dumps(seeds))
+            finally:
+                fcntl.flock(pool_file, fcntl.LOCK_UN)
+
+    @classmethod
+    async def acquire(cls, client: AsyncJsonRpcClient) -> Wallet:
+        """Pops a pooled wallet, falling back to the faucet when empty."""
+        seed = cls._pop_seed()
+        if seed is not None:
+            return Wallet.from_seed(seed)
+        return await generate_faucet_wallet(client)
+
+
+async def _sign_offloaded(tx, client: AsyncJsonRpcClient, wallet: Wallet):
+    """
+    Autofills and signs `tx` with the signing itself on a worker thread:
+    ed25519/secp256k1 signing is ~1 ms of pure-Python CPU that would
+    otherwise serialize every coroutine under a gather of submits.
+    """
+    filled = await autofill(tx, client)
+    return await asyncio.to_thread(sign, filled, wallet)
+
+
+async def _wait_for_validation(client: AsyncJsonRpcClient, tx_hash: str,
+                               last_ledger_sequence: Optional[int] = None):
+    """
+    Polls `tx` until `tx_hash` validates. Bounded by `last_ledger_sequence`:
+    once the validated ledger passes it the transaction can no longer
+    succeed, so the wait raises instead of spinning forever.
+    """
+    while True:
+        await asyncio.sleep(1.0)
+        try:
+            resp = await client.request(Tx(transaction=tx_hash))
+        except Exception:
+            resp = None  # not yet in a ledger the server knows about
+        if resp is not None and resp.result.get("validated"):
+            return resp
+        if last_ledger_sequence is not None:
+            latest = await get_latest_validated_ledger_sequence(client)
+            if latest > last_ledger_sequence:
+                raise RuntimeError(
+                    f"Transaction {tx_hash} not validated by ledger "
+                    f"{last_ledger_sequence}"
+                )
+
+
+async def submit_and_wait_ws(tx, client: AsyncJsonRpcClient, wallet: Wallet, ws_url: str):
+    """
+    Submits `tx` and waits for validation via a transaction-stream push
+    instead of polling `tx` on a fixed interval. Saves the poll RPCs and
+    returns as soon as the ledger actually closes. Once the submit has
+    gone out, a dropped stream degrades to polling the submitted hash —
+    it never escapes as an exception that could trigger a resubmit of a
+    sequence that may already have validated.
+    """
+    tx_hash = None
+    signed = None
+    expired = False
+    try:
+        async with AsyncWebsocketClient(ws_url) as ws:
+            # accounts=[...] alone pushes every validated tx touching the
+            # account; the global transaction stream would drown us in the
+            # whole network's traffic just to filter by hash here. The
+            # ledger stream (one push per close) carries the index needed
+            # for the expiry bail-out below.
+            await ws.send(Subscribe(streams=["ledger"], accounts=[wallet.classic_address]))
+            signed = await _sign_offloaded(tx, client, wallet)
+            submit_resp = await submit(signed, client)
+            prelim = submit_resp.result.get("engine_result", "")
+            if prelim != "tesSUCCESS" and not prelim.startswith("tec"):
+                # A tem/tef-class rejection never reaches a validated ledger,
+                # so waiting on the stream for it would hang forever.
+                raise RuntimeError(
+                    f"Transaction rejected at submission: {prelim} "
+                    f"({submit_resp.result.get('engine_result_message', '')})"
+                )
+            tx_hash = submit_resp.result.get("tx_json", {}).get("hash")
+            if not tx_hash:
+                raise RuntimeError(f"Submit did not return a hash: {submit_resp.result}")
+            async for msg in ws:
+                if (signed.last_ledger_sequence is not None
+                        and msg.get("ledger_index", 0) > signed.last_ledger_sequence):
+                    # Past LastLedgerSequence no push for the hash can ever
+                    # arrive; without this the wait hangs on a healthy stream.
+                    expired = True
+                    break
+                item = msg.get("transaction") or msg.get("tx_json") or {}
+                if item.get("hash") == tx_hash:
+                    break
+    except Exception:
+        if tx_hash is None:
+            raise  # nothing hit the network; the caller is free to retry
+        return await _wait_for_validation(client, tx_hash, signed.last_ledger_sequence)
+    if expired:
+        # Authoritative check: either it validated just before expiring —
+        # the push racing the ledger close — or this raises.
+        return await _wait_for_validation(client, tx_hash, signed.last_ledger_sequence)
+    # One final fetch for the validated result in the shape callers expect.
+    return await client.request(Tx(transaction=tx_hash))
+
+
+async def wait_until_ripple_time(release: datetime, ws_url: str) -> None:
+    """
+    Blocks until the ledger's close time reaches `release`, by watching the
+    ledger stream rather than sleeping a fixed interval. Returns on the
+    first ledger whose close time passes the release — no slack needed.
     """
-    preimage = os.urandom(32)
-    cc = PreimageSha256(preimage)
-    condition_hex = cc.condition_binary.hex().upper()
-    fulfillment_hex = cc.serialize_binary().hex().upper()
-    return condition_hex, fulfillment_hex
+    target = to_ripple_time(release)
+    async with AsyncWebsocketClient(ws_url) as ws:
+        await ws.send(Subscribe(streams=["ledger"]))
+        async for msg in ws:
+            if msg.get("ledger_time", 0) >= target:
+                return
 
 
 # -------------------------
 # XRPL Account (Async)
 # -------------------------
 
-@dataclass
+@dataclass(slots=True)
+class TrustlineView:
+    """
+    One-fetch snapshot of a trustline: existence, limit, balance and the
+    remaining receiving capacity, extracted from a single AccountLines call.
+    Amounts are Decimal — ledger values are decimal strings, and float
+    round-off here could wrongly reject (or accept) a send.
+    """
+    exists: bool
+    limit: Decimal
+    balance: Decimal
+    remaining: Decimal
+
+
+@dataclass(slots=True)
+class AccountSnapshot:
+    """
+    One-round-trip view of an account — XRP balance, trustlines and open
+    offers — produced by XRPAccount.snapshot() for callers that would
+    otherwise await the three reads back to back.
+    """
+    xrp_balance: Decimal
+    lines: list
+    offers: list
+
+
+@dataclass(slots=True)
 class XRPAccount:
     username: str
     wallet: Wallet
     client: AsyncJsonRpcClient
 
-    @property
-    def address(self) -> str:
-        return self.wallet.classic_address
+    # Pinned once in __post_init__: wallet.classic_address is itself a
+    # property recomputed from the public key on every access.
+    address: str = field(init=False)
+
+    # Locally tracked next transaction sequence. Fetched once, then
+    # incremented per submission, saving the account_info round trip
+    # autofill would otherwise make before every sign. None means "fetch
+    # on next use" — the reset state after any submission failure.
+    _next_sequence: Optional[int] = field(default=None, init=False)
+
+    # (url, amendment_id) -> (fetched_at, enabled), shared by all accounts.
+    _feature_cache: ClassVar[Dict[Tuple[str, str], Tuple[float, bool]]] = {}
+
+    # (account, currency, issuer) -> (fetched_at, snapshot), shared by all
+    # accounts; entries expire after TRUSTLINE_CACHE_TTL or on write.
+    _trustline_cache: ClassVar[Dict[Tuple[str, str, str], Tuple[float, TrustlineView]]] = {}
+
+    # (account, peer) -> (fetched_at, {currency: line}): the AccountLines
+    # page indexed by currency, so checks on different currencies against
+    # the same peer share one fetch and each lookup is a dict hit instead
+    # of a rescan. Same TTL and write invalidation as the snapshot cache.
+    _lines_cache: ClassVar[Dict[Tuple[str, str], Tuple[float, Dict[str, Dict[str, Any]]]]] = {}
+
+    # Set to a wss:// URL (e.g. wss://s.altnet.rippletest.net:51233) to wait
+    # for validation via stream pushes instead of polling.
+    WS_URL: ClassVar[Optional[str]] = None
+
+    def __post_init__(self) -> None:
+        self.address = self.wallet.classic_address
+
+    async def _next_seq(self) -> int:
+        if self._next_sequence is None:
+            resp = await self.client.request(
+                AccountInfo(account=self.address, ledger_index="current")
+            )
+            self._next_sequence = int(resp.result["account_data"]["Sequence"])
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        return sequence
+
+    async def _submit(self, tx):
+        """
+        Signs, submits and waits for validation. Uses the websocket push
+        path when WS_URL is set, falling back to submit_and_wait polling.
+        The sequence comes from the local counter, so back-to-back sends
+        skip autofill's per-transaction account_info fetch.
+        """
+        if tx.sequence is None:
+            tx_dict = tx.to_dict()
+            tx_dict["sequence"] = await self._next_seq()
+            tx = type(tx).from_dict(tx_dict)
+        try:
+            if self.WS_URL:
+                try:
+                    return await submit_and_wait_ws(tx, self.client, self.wallet, self.WS_URL)
+                except Exception:
+                    pass  # push path failed — the polling path below still works
+            # Pre-sign off the event loop; submit_and_wait takes the signed
+            # tx as-is and only polls for validation.
+            signed = await _sign_offloaded(tx, self.client, self.wallet)
+            return await submit_and_wait(signed, self.client)
+        except Exception:
+            # Resync on the next submission: the failure may have been
+            # tefPAST_SEQ/terPRE_SEQ or left a gap in the local counter.
+            self._next_sequence = None
+            raise
 
     @classmethod
     async def create_new(cls, username: str, client: AsyncJsonRpcClient) -> "XRPAccount":
-        funded_wallet = await generate_faucet_wallet(client)
+        # Pooled wallets skip the ~10s faucet wait; the faucet is only hit
+        # when the pool file is empty or absent.
+        funded_wallet = await WalletPool.acquire(client)
         return cls(username=username, wallet=funded_wallet, client=client)
 
+    async def submit_many(self, txs: list) -> list:
+        """
+        Submits several of this account's transactions concurrently and
+        waits for all of them at once: sequences are pre-allocated from one
+        AccountInfo read, signing fans out across threads, and a single
+        transaction-stream subscription (or one polling loop) watches every
+        pending hash — O(1) validation waits instead of one per tx.
+        Results come back in submission order.
+        """
+        sequenced = []
+        for tx in txs:
+            tx_dict = tx.to_dict()
+            tx_dict["sequence"] = await self._next_seq()
+            sequenced.append(type(tx).from_dict(tx_dict))
+        try:
+            signed = await asyncio.gather(
+                *(_sign_offloaded(tx, self.client, self.wallet) for tx in sequenced)
+            )
+            hashes = [tx.get_hash() for tx in signed]
+            prelims = await asyncio.gather(*(submit(tx, self.client) for tx in signed))
+        except Exception:
+            self._next_sequence = None  # resync after a partial failure
+            raise
+        rejected = [
+            (tx_hash, resp.result.get("engine_result", ""))
+            for tx_hash, resp in zip(hashes, prelims)
+            if resp.result.get("engine_result", "").startswith(("tem", "tef"))
+        ]
+        if rejected:
+            # A tem/tef rejection never validates, and its unconsumed
+            # sequence leaves every later tx in the batch stuck at
+            # terPRE_SEQ — waiting on any of them would spin forever.
+            self._next_sequence = None
+            raise RuntimeError(f"Rejected at submission: {rejected}")
+
+        # Past the highest LastLedgerSequence in the batch nothing still
+        # pending can validate; both waits below bail out on that ledger.
+        max_last_ledger = max(
+            (tx.last_ledger_sequence for tx in signed if tx.last_ledger_sequence),
+            default=None,
+        )
+        pending = set(hashes)
+        if self.WS_URL:
+            try:
+                async with AsyncWebsocketClient(self.WS_URL) as ws:
+                    # The ledger stream (one push per close) carries the
+                    # index needed for the expiry bail-out.
+                    await ws.send(Subscribe(streams=["ledger"], accounts=[self.address]))
+                    async for msg in ws:
+                        if (max_last_ledger is not None
+                                and msg.get("ledger_index", 0) > max_last_ledger):
+                            break  # expired — let the polling loop decide
+                        item = msg.get("transaction") or msg.get("tx_json") or {}
+                        pending.discard(item.get("hash"))
+                        if not pending:
+                            break
+            except Exception:
+                pass  # push path failed — the polling loop below still works
+        while pending:
+            await asyncio.sleep(1.0)
+            checks = await asyncio.gather(
+                *(self.client.request(Tx(transaction=tx_hash)) for tx_hash in list(pending)),
+                return_exceptions=True,
+            )
+            for tx_hash, check in zip(list(pending), checks):
+                if not isinstance(check, Exception) and check.result.get("validated"):
+                    pending.discard(tx_hash)
+            if pending and max_last_ledger is not None:
+                latest = await get_latest_validated_ledger_sequence(self.client)
+                if latest > max_last_ledger:
+                    self._next_sequence = None
+                    raise RuntimeError(
+                        f"{len(pending)} transaction(s) expired unvalidated "
+                        f"past ledger {max_last_ledger}: {sorted(pending)}"
+                    )
+        # Balances may have moved in ways we can't attribute per-line here.
+        self._trustline_cache.clear()
+        self._lines_cache.clear()
+        final = await asyncio.gather(
+            *(self.client.request(Tx(transaction=tx_hash)) for tx_hash in hashes)
+        )
+        return [check.result for check in final]
+
     # ---------- Basic info ----------
     async def get_xrp_balance(self) -> float:
         resp = await self.client.request(AccountInfo(account=self.address, ledger_index="validated"))
         drops = int(resp.result["account_data"]["Balance"])
         return drops / 1_000_000
 
-    async def _get_trustline_line(self, account_address: str, currency: str, issuer: str) -> Optional[Dict[str, Any]]:
+    async def _get_trustline_line(self, account_address: str, currency: str, issuer: str,
+                                  lines: Optional[list] = None) -> Optional[Dict[str, Any]]:
         """
         Reads trustline data from `account_address` with peer=issuer, returns the matching line if exists.
+        Callers that already hold an account_lines result can pass it via `lines` to skip the fetch.
         """
-        req = AccountLines(account=account_address, peer=issuer)
-        resp = await self.client.request(req)
-        lines = resp.result.get("lines", [])
-        for line in lines:
-            if line.get("currency") == currency and line.get("account") == issuer:
-                return line
-        # Some servers return lines without "account" matching logic exactly; currency+peer is usually enough:
-        for line in lines:
-            if line.get("currency") == currency:
-                return line
-        return None
+        if lines is not None:
+            # Caller-provided page: one linear pass, no cache interaction.
+            # (peer=issuer was in the request, so currency alone is enough.)
+            return next((line for line in lines if line.get("currency") == currency), None)
+        key = (account_address, issuer)
+        cached = self._lines_cache.get(key)
+        if cached and time.monotonic() - cached[0] < TRUSTLINE_CACHE_TTL:
+            by_currency = cached[1]
+        else:
+            req = AccountLines(account=account_address, peer=issuer)
+            resp = await self.client.request(req)
+            by_currency = {}
+            for line in resp.result.get("lines", []):
+                by_currency.setdefault(line.get("currency"), line)
+            if len(self._lines_cache) > 1024:
+                self._lines_cache.clear()
+            self._lines_cache[key] = (time.monotonic(), by_currency)
+        return by_currency.get(currency)
+
+    async def _trustline_snapshot(self, account_address: str, currency: str, issuer: str,
+                                  lines: Optional[list] = None) -> TrustlineView:
+        """
+        Reads a trustline once and extracts every field the checked paths
+        need, so existence, remaining space and balance all come from the
+        same AccountLines round trip. Fresh snapshots are cached briefly
+        (TRUSTLINE_CACHE_TTL); write methods invalidate the lines they touch.
+        """
+        key = (account_address, currency, issuer)
+        if lines is None:
+            cached = self._trustline_cache.get(key)
+            if cached and time.monotonic() - cached[0] < TRUSTLINE_CACHE_TTL:
+                return cached[1]
+        line = await self._get_trustline_line(account_address, currency, issuer, lines=lines)
+        if not line:
+            zero = Decimal(0)
+            snapshot = TrustlineView(exists=False, limit=zero, balance=zero, remaining=zero)
+        else:
+            limit = _dec(line.get("limit", "0"))
+            balance = _dec(line.get("balance", "0"))
+            # For typical holders, balance is >= 0. Remaining capacity:
+            snapshot = TrustlineView(exists=True, limit=limit, balance=balance,
+                                     remaining=limit - balance)
+        if len(self._trustline_cache) > 1024:
+            self._trustline_cache.clear()
+        self._trustline_cache[key] = (time.monotonic(), snapshot)
+        return snapshot
+
+    @classmethod
+    def _invalidate_trustline(cls, account_address: str, currency: str, issuer: str) -> None:
+        cls._trustline_cache.pop((account_address, currency, issuer), None)
+        cls._lines_cache.pop((account_address, issuer), None)
 
     async def has_trustline(self, account_address: str, currency: str, issuer: str) -> bool:
-        return (await self._get_trustline_line(account_address, currency, issuer)) is not None
+        return (await self._trustline_snapshot(account_address, currency, issuer)).exists
 
-    async def trustline_remaining_space(self, account_address: str, currency: str, issuer: str) -> Optional[float]:
+    async def trustline_remaining_space(self, account_address: str, currency: str, issuer: str) -> Optional[Decimal]:
         """
         Returns how much more of this token the account can receive (limit - balance).
         If no trustline exists, returns None.
         """
-        line = await self._get_trustline_line(account_address, currency, issuer)
-        if not line:
-            return None
-
-        limit = float(line.get("limit", "0"))
-        balance = float(line.get("balance", "0"))
-        # For typical holders, balance is >= 0. Remaining receiving capacity:
-        return limit - balance
+        snapshot = await self._trustline_snapshot(account_address, currency, issuer)
+        return snapshot.remaining if snapshot.exists else None
 
     # ---------- XRP: instant ----------
     async def send_xrp(self, destination: str, amount_xrp: float) -> Dict[str, Any]:
-        tx = Payment(
-            account=self.address,
-            destination=destination,
-            amount=xrp_to_drops(amount_xrp),
-        )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        tx = _xrp_payment_tx(self.address, destination, _xrp_to_drops(amount_xrp))
+        resp = await self._submit(tx)
         return resp.result
 
     # ---------- XRP: timed escrow ----------
@@ -119,11 +787,11 @@ class XRPAccount:
         tx = EscrowCreate(
             account=self.address,
             destination=destination,
-            amount=xrp_to_drops(amount_xrp),
+            amount=_xrp_to_drops(amount_xrp),
             finish_after=to_ripple_time(release_time_utc),
             cancel_after=to_ripple_time(cancel_after_utc) if cancel_after_utc else None,
         )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        resp = await self._submit(tx)
         escrow_sequence = resp.result.get("tx_json", {}).get("Sequence")
         if escrow_sequence is None:
             raise RuntimeError(f"Could not read escrow sequence from: {resp.result}")
@@ -139,39 +807,43 @@ class XRPAccount:
             offer_sequence=int(escrow_sequence),
             fulfillment=fulfillment_hex,
         )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        resp = await self._submit(tx)
+        # A finished token escrow moves an IOU balance we can't name from
+        # here (only the owner/sequence are known) — drop all snapshots.
+        self._trustline_cache.clear()
+        self._lines_cache.clear()
         return resp.result
 
     # ---------- Trustlines ----------
     async def set_trust_line(self, currency: str, issuer: str, limit: str = "1000000") -> Dict[str, Any]:
-        tx = TrustSet(
-            account=self.address,
-            limit_amount={
-                "currency": currency,
-                "issuer": issuer,
-                "value": limit,
-            },
-        )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        tx = _trust_set_tx(self.address, currency, issuer, limit)
+        resp = await self._submit(tx)
+        self._invalidate_trustline(self.address, currency, issuer)
         return resp.result
 
     # ---------- Tokens (IOUs): safe send ----------
-    async def send_token_checked(self, destination: str, currency: str, issuer: str, amount: str) -> Dict[str, Any]:
+    async def send_token_checked(self, destination: str, currency: str, issuer: str, amount: str,
+                                 skip_precheck: bool = False,
+                                 lines: Optional[list] = None) -> Dict[str, Any]:
         """
         Sends token only if the destination has a trustline AND has enough remaining space.
+        The pre-check costs one AccountLines round trip (served from the
+        snapshot cache when warm); callers holding a fresh page for the
+        destination can pass it via `lines`, and bulk airdrops or retry
+        loops can pass skip_precheck to let the ledger's tec result codes
+        enforce funding instead.
         """
-        remaining = await self.trustline_remaining_space(destination, currency, issuer)
-        if remaining is None:
-            raise ValueError(f"Destination has NO trustline for {currency}.{issuer}")
-        if float(amount) > remaining:
-            raise ValueError(f"Destination trustline limit too small. Remaining space: {remaining} {currency}")
+        if not skip_precheck:
+            snapshot = await self._trustline_snapshot(destination, currency, issuer, lines=lines)
+            if not snapshot.exists:
+                raise ValueError(f"Destination has NO trustline for {currency}.{issuer}")
+            if _dec(str(amount)) > snapshot.remaining:
+                raise ValueError(f"Destination trustline limit too small. Remaining space: {snapshot.remaining} {currency}")
 
-        tx = Payment(
-            account=self.address,
-            destination=destination,
-            amount={"currency": currency, "issuer": issuer, "value": str(amount)},
-        )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        tx = _iou_payment_tx(self.address, destination, currency, issuer, str(amount))
+        resp = await self._submit(tx)
+        self._invalidate_trustline(self.address, currency, issuer)
+        self._invalidate_trustline(destination, currency, issuer)
         return resp.result
 
     # ---------- DEX OfferCreate: checked ----------
@@ -188,39 +860,114 @@ class XRPAccount:
         Creates a public DEX offer: "I give give_amount give_currency to receive want_amount want_currency".
         Safety checks:
           - Must have trustline to RECEIVE want token (and space)
-          - If giving token, it's your responsibility to have balance; XRPL will enforce funding anyway
+          - Must hold enough of the give token (unless issuing it); XRPL
+            would enforce funding anyway, but failing locally is free
         """
-        # Check you can RECEIVE what you want (trustline + space)
-        remaining = await self.trustline_remaining_space(self.address, want_currency, want_issuer)
-        if remaining is None:
+        # Both sides' reads go out together: with a shared issuer one
+        # AccountLines covers both currencies, otherwise the two snapshot
+        # reads are gathered — one round trip of wall time either way.
+        if give_issuer == want_issuer:
+            resp = await self.client.request(AccountLines(account=self.address, peer=want_issuer))
+            lines = resp.result.get("lines", [])
+            give_snapshot, want_snapshot = await asyncio.gather(
+                self._trustline_snapshot(self.address, give_currency, give_issuer, lines=lines),
+                self._trustline_snapshot(self.address, want_currency, want_issuer, lines=lines),
+            )
+        else:
+            give_snapshot, want_snapshot = await asyncio.gather(
+                self._trustline_snapshot(self.address, give_currency, give_issuer),
+                self._trustline_snapshot(self.address, want_currency, want_issuer),
+            )
+        if not want_snapshot.exists:
             raise ValueError(f"{self.username} has NO trustline for wanted token {want_currency}.{want_issuer}")
-        if float(want_amount) > remaining:
-            raise ValueError(f"{self.username} cannot receive {want_amount}; remaining space is {remaining} {want_currency}")
-
-        taker_gets = {"currency": give_currency, "issuer": give_issuer, "value": str(give_amount)}
-        taker_pays = {"currency": want_currency, "issuer": want_issuer, "value": str(want_amount)}
+        if _dec(str(want_amount)) > want_snapshot.remaining:
+            raise ValueError(f"{self.username} cannot receive {want_amount}; remaining space is {want_snapshot.remaining} {want_currency}")
+        if self.address != give_issuer and _dec(str(give_amount)) > give_snapshot.balance:
+            raise ValueError(f"{self.username} holds {give_snapshot.balance} {give_currency}; cannot give {give_amount}")
 
-        tx = OfferCreate(
-            account=self.address,
-            taker_gets=taker_gets,
-            taker_pays=taker_pays,
+        tx = _offer_create_tx(
+            self.address,
+            give_currency, give_issuer, str(give_amount),
+            want_currency, want_issuer, str(want_amount),
         )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        resp = await self._submit(tx)
+        # An offer may cross immediately and move both balances.
+        self._invalidate_trustline(self.address, give_currency, give_issuer)
+        self._invalidate_trustline(self.address, want_currency, want_issuer)
         return resp.result
 
-    # ---------- Token Escrow support check ----------
+    # ---------- Amendment support checks ----------
+    def _feature_request(self, amendment_id: str) -> GenericRequest:
+        # `feature` with an ID returns just that amendment's status (~200
+        # bytes) instead of server_state's full amendment list (~10 KB).
+        return GenericRequest(method="feature", feature=amendment_id)
+
+    def _cached_feature(self, amendment_id: str) -> Optional[bool]:
+        cached = self._feature_cache.get((self.client.url, amendment_id))
+        if cached and time.monotonic() - cached[0] < AMENDMENTS_CACHE_TTL:
+            return cached[1]
+        return None
+
+    def _cache_feature(self, amendment_id: str, feature_result: Dict[str, Any]) -> bool:
+        info = feature_result.get("features", {}).get(amendment_id, {})
+        enabled = bool(info.get("enabled", False))
+        self._feature_cache[(self.client.url, amendment_id)] = (time.monotonic(), enabled)
+        return enabled
+
+    async def _amendment_enabled(self, amendment_id: str) -> bool:
+        enabled = self._cached_feature(amendment_id)
+        if enabled is None:
+            resp = await self.client.request(self._feature_request(amendment_id))
+            enabled = self._cache_feature(amendment_id, resp.result)
+        return enabled
+
     async def token_escrow_enabled(self) -> bool:
         """
         Token escrow (IOU escrow) requires TokenEscrow (XLS-85) amendment.
         Not always enabled on every network/server.
         """
-        resp = await self.client.request(ServerState())
-        amendments = resp.result.get("state", {}).get("validated_ledger", {}).get("amendments", [])
+        return await self._amendment_enabled(TOKEN_ESCROW_ID)
+
+    # ---------- XLS-56 Batch ----------
+    async def submit_batch(self, inner_txs: list, all_or_nothing: bool = True) -> Dict[str, Any]:
+        """
+        Submits several of this account's transactions as one XLS-56 Batch:
+        one signature, one ledger round, atomic when all_or_nothing. Falls
+        back to submitting them one by one when the Batch amendment isn't
+        active on the server (or xrpl-py predates the Batch model).
+        """
+        try:
+            from xrpl.models.transactions import Batch
+        except ImportError:
+            Batch = None
+        if Batch is not None and await self._amendment_enabled(BATCH_ID):
+            tx = Batch(
+                account=self.address,
+                raw_transactions=inner_txs,
+                flags=TF_ALL_OR_NOTHING if all_or_nothing else TF_INDEPENDENT,
+            )
+            resp = await self._submit(tx)
+            return {"batched": True, "results": [resp.result]}
+        results = []
+        for tx in inner_txs:
+            resp = await self._submit(tx)
+            results.append(resp.result)
+        return {"batched": False, "results": results}
 
-        # TokenEscrow amendment ID (XLS-85). If your server returns only IDs, this works.
-        # If your server returns names differently, you may need to print amendments to confirm.
-        TOKEN_ESCROW_ID = "138B968F25822EFBF54C00F97031221C47B1EAB8321D93C7C2AEAF85F04EC5DF"
-        return TOKEN_ESCROW_ID in amendments
+    async def send_xrp_batch(self, destinations: list,
+                             all_or_nothing: bool = False) -> Dict[str, Any]:
+        """
+        Fans out XRP payments to many (destination, amount_xrp) pairs as a
+        single XLS-56 Batch submission — one signature and one consensus
+        round instead of one ledger wait per recipient. Independent mode by
+        default so one failing leg doesn't void the rest; submit_batch's
+        fallback covers servers without the amendment.
+        """
+        txs = [
+            _xrp_payment_tx(self.address, destination, _xrp_to_drops(amount_xrp))
+            for destination, amount_xrp in destinations
+        ]
+        return await self.submit_batch(txs, all_or_nothing=all_or_nothing)
 
     # ---------- Private swap using Token Escrow (ONLY if supported) ----------
     async def create_conditional_token_escrow(
@@ -231,19 +978,45 @@ class XRPAccount:
         amount: str,
         condition_hex: str,
         cancel_after_utc: datetime,
+        destination_lines: Optional[list] = None,
     ) -> Dict[str, Any]:
         """
         Locks IOU tokens in escrow with a crypto-condition (requires TokenEscrow enabled).
+        Batch-escrow callers that prefetched the destination's AccountLines
+        (one gathered/batched read per destination) can pass it via
+        `destination_lines` so each escrow here costs zero extra reads.
         """
-        if not await self.token_escrow_enabled():
-            raise RuntimeError("TokenEscrow (XLS-85) is NOT enabled on this server/network. Use DEX offers instead.")
+        # Both pre-flight reads (amendment check + destination trustline) can
+        # ride in one JSON-RPC batch POST when the client supports it. With a
+        # fresh feature cache only the trustline read goes out at all.
+        enabled = self._cached_feature(TOKEN_ESCROW_ID)
+        batch = getattr(self.client, "batch_request", None)
+        if destination_lines is not None:
+            if enabled is None:
+                enabled = await self._amendment_enabled(TOKEN_ESCROW_ID)
+            snapshot = await self._trustline_snapshot(
+                destination, currency, issuer, lines=destination_lines,
+            )
+        elif enabled is None and batch is not None:
+            feature_resp, lines_resp = await batch([
+                self._feature_request(TOKEN_ESCROW_ID),
+                AccountLines(account=destination, peer=issuer),
+            ])
+            enabled = self._cache_feature(TOKEN_ESCROW_ID, feature_resp.result)
+            snapshot = await self._trustline_snapshot(
+                destination, currency, issuer,
+                lines=lines_resp.result.get("lines", []),
+            )
+        else:
+            enabled = await self.token_escrow_enabled()
+            snapshot = await self._trustline_snapshot(destination, currency, issuer)
 
-        # Also ensure destination trustline exists & has space (so finish will succeed)
-        remaining = await self.trustline_remaining_space(destination, currency, issuer)
-        if remaining is None:
+        if not enabled:
+            raise RuntimeError("TokenEscrow (XLS-85) is NOT enabled on this server/network. Use DEX offers instead.")
+        if not snapshot.exists:
             raise ValueError(f"Destination has NO trustline for {currency}.{issuer}")
-        if float(amount) > remaining:
-            raise ValueError(f"Destination trustline cannot receive {amount}; remaining is {remaining} {currency}")
+        if _dec(str(amount)) > snapshot.remaining:
+            raise ValueError(f"Destination trustline cannot receive {amount}; remaining is {snapshot.remaining} {currency}")
 
         tx = EscrowCreate(
             account=self.address,
@@ -252,7 +1025,8 @@ class XRPAccount:
             condition=condition_hex,
             cancel_after=to_ripple_time(cancel_after_utc),
         )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        resp = await self._submit(tx)
+        self._invalidate_trustline(self.address, currency, issuer)
         escrow_sequence = resp.result.get("tx_json", {}).get("Sequence")
         if escrow_sequence is None:
             raise RuntimeError(f"Could not read escrow sequence from: {resp.result}")
@@ -272,31 +1046,138 @@ class XRPAccount:
         If Alice offered: give 10 TKA for 50 TKB,
         then Bob submits: give 50 TKB for 10 TKA.
         """
-        tx = OfferCreate(
-            account=self.address,
-            taker_gets={"currency": offer_owner_want_currency, "issuer": offer_owner_want_issuer,
-                        "value": str(offer_owner_want_amount)},
-            taker_pays={"currency": offer_owner_give_currency, "issuer": offer_owner_give_issuer,
-                        "value": str(offer_owner_give_amount)},
+        tx = _offer_create_tx(
+            self.address,
+            offer_owner_want_currency, offer_owner_want_issuer, str(offer_owner_want_amount),
+            offer_owner_give_currency, offer_owner_give_issuer, str(offer_owner_give_amount),
         )
-        resp = await submit_and_wait(tx, self.client, self.wallet)
+        resp = await self._submit(tx)
+        self._invalidate_trustline(self.address, offer_owner_give_currency, offer_owner_give_issuer)
+        self._invalidate_trustline(self.address, offer_owner_want_currency, offer_owner_want_issuer)
         return resp.result
 
-    async def get_token_balance(self, currency: str, issuer: str) -> float:
+    async def get_token_balance(self, currency: str, issuer: str) -> Decimal:
         """
         Returns how much of a token THIS account holds.
         If no trustline exists, returns 0.0
         """
-        request = AccountLines(account=self.address, peer=issuer)
-        response = await self.client.request(request)
+        snapshot = await self._trustline_snapshot(self.address, currency, issuer)
+        return snapshot.balance
+
+    # ---------- Account views ----------
+    async def get_trustlines(self) -> list:
+        """
+        Returns all trustlines this account holds.
+        """
+        resp = await self.client.request(AccountLines(account=self.address))
+        return resp.result.get("lines", [])
+
+    async def get_open_offers(self) -> list:
+        """
+        Returns this account's open DEX offers.
+        """
+        resp = await self.client.request(AccountOffers(account=self.address))
+        return resp.result.get("offers", [])
 
-        lines = response.result.get("lines", [])
+    async def snapshot(self) -> AccountSnapshot:
+        """
+        Fetches XRP balance, trustlines and open offers against the same
+        validated ledger for the price of one round trip: a batched POST
+        when the client supports it, a gather of three otherwise.
+        """
+        reqs = [
+            AccountInfo(account=self.address, ledger_index="validated"),
+            AccountLines(account=self.address, ledger_index="validated"),
+            AccountOffers(account=self.address, ledger_index="validated"),
+        ]
+        batch = getattr(self.client, "batch_request", None)
+        if batch is not None:
+            info_resp, lines_resp, offers_resp = await batch(reqs)
+        else:
+            info_resp, lines_resp, offers_resp = await asyncio.gather(
+                *(self.client.request(req) for req in reqs)
+            )
+        drops = int(info_resp.result["account_data"]["Balance"])
+        return AccountSnapshot(
+            xrp_balance=Decimal(drops) / 1_000_000,
+            lines=lines_resp.result.get("lines", []),
+            offers=offers_resp.result.get("offers", []),
+        )
 
-        for line in lines:
-            if line.get("currency") == currency:
-                return float(line.get("balance", "0"))
+    async def get_offer_status(self, offer_sequence: int) -> Dict[str, Any]:
+        """
+        Resolves the state of one of this account's offers by sequence:
+        "open" if it's still on the books, otherwise "filled"/"cancelled"
+        inferred from history ("unknown" once pagination is exhausted).
+        The offers read and the first history page ship as one batched
+        POST (a gather on plain clients); older pages are only fetched if
+        the first page is inconclusive, so the common recent-offer case
+        parses ~50 rows instead of a fixed 200-row blob.
+        """
+        offers_req = AccountOffers(account=self.address)
+        tx_req = AccountTx(account=self.address, limit=50, forward=False)
+        batch = getattr(self.client, "batch_request", None)
+        if batch is not None:
+            offers_resp, tx_resp = await batch([offers_req, tx_req])
+        else:
+            offers_resp, tx_resp = await asyncio.gather(
+                self.client.request(offers_req),
+                self.client.request(tx_req),
+            )
+        offers_by_seq = {offer.get("seq"): offer for offer in offers_resp.result.get("offers", [])}
+        offer = offers_by_seq.get(offer_sequence)
+        if offer is not None:
+            return {"status": "open", "offer": offer}
+        # Pages arrive newest first, so a cancel referencing the offer is
+        # always seen before the create it cancelled — both are terminal.
+        transactions = tx_resp.result.get("transactions", [])
+        marker = tx_resp.result.get("marker")
+        while True:
+            for entry in transactions:
+                tx = entry.get("tx") or entry.get("tx_json") or {}
+                if tx.get("Account") != self.address:
+                    continue
+                tx_type = tx.get("TransactionType")
+                if tx_type == "OfferCancel" and tx.get("OfferSequence") == offer_sequence:
+                    return {"status": "cancelled", "tx": tx}
+                if tx_type == "OfferCreate" and tx.get("Sequence") == offer_sequence:
+                    # The create is in history but the offer is off the books.
+                    return {"status": "filled", "tx": tx}
+            if marker is None:
+                return {"status": "unknown", "offer": None}
+            resp = await self.client.request(
+                AccountTx(account=self.address, limit=50, forward=False, marker=marker)
+            )
+            transactions = resp.result.get("transactions", [])
+            marker = resp.result.get("marker")
 
-        return 0.0
+    async def iter_transaction_history(self, page_size: int = 50):
+        """
+        Yields transactions touching this account newest first, one ledger
+        page at a time via AccountTx marker pagination, so callers can start
+        consuming after the first page instead of waiting for the full set.
+        """
+        marker = None
+        while True:
+            req = AccountTx(account=self.address, limit=page_size, marker=marker)
+            resp = await self.client.request(req)
+            for tx in resp.result.get("transactions", []):
+                yield tx
+            marker = resp.result.get("marker")
+            if marker is None:
+                return
+
+    async def get_transaction_history(self, limit: int = 200) -> list:
+        """
+        Returns up to `limit` recent transactions touching this account,
+        newest first.
+        """
+        transactions = []
+        async for tx in self.iter_transaction_history():
+            transactions.append(tx)
+            if len(transactions) >= limit:
+                break
+        return transactions
 
 
 
@@ -306,5 +1187,69 @@ class XRPAccount:
 # -------------------------
 
 async def main():
-    client = AsyncJsonRpcClient("https://s.altnet.rippletest.net:51234")
+    client = CompressedAsyncJsonRpcClient("https://s.altnet.rippletest.net:51234")
+
+    # Faucet funding takes several seconds per wallet and the three are
+    # independent — run them concurrently.
+    print("--- Funding testnet wallets ---")
+    alice, bob, issuer = await asyncio.gather(
+        XRPAccount.create_new("Alice", client),
+        XRPAccount.create_new("Bob", client),
+        XRPAccount.create_new("Issuer", client),
+    )
+
+    # [1] Trustlines. All four are independent, so run them concurrently:
+    # one round trip of wall time instead of four.
+    print("--- Setting trustlines ---")
+    await asyncio.gather(
+        alice.set_trust_line("TKA", issuer.address),
+        alice.set_trust_line("TKB", issuer.address),
+        bob.set_trust_line("TKA", issuer.address),
+        bob.set_trust_line("TKB", issuer.address),
+    )
+
+    # [2] Token issuance. Both payments come from the issuer (the trustlines
+    # were just set above), so when the Batch amendment is live they ship as
+    # one atomic XLS-56 transaction; otherwise submit_batch falls back to
+    # submitting them individually.
+    print("--- Issuing tokens ---")
+    await issuer.submit_batch([
+        _iou_payment_tx(issuer.address, alice.address, "TKA", issuer.address, "100"),
+        _iou_payment_tx(issuer.address, bob.address, "TKB", issuer.address, "500"),
+    ])
+
+    async def balances(account: XRPAccount):
+        return await asyncio.gather(
+            account.get_token_balance("TKA", issuer.address),
+            account.get_token_balance("TKB", issuer.address),
+        )
+
+    (a_tka, a_tkb), (b_tka, b_tkb) = await asyncio.gather(balances(alice), balances(bob))
+    print("--- Balances before trade ---")
+    print(f"Alice: {a_tka} TKA / {a_tkb} TKB")
+    print(f"Bob:   {b_tka} TKA / {b_tkb} TKB")
+
+    # [3] Alice offers 10 TKA for 50 TKB on the DEX; Bob crosses it.
+    print("--- Trading on the DEX ---")
+    await alice.create_offer_checked("TKA", issuer.address, "10", "TKB", issuer.address, "50")
+    await bob.take_offer_exact("TKA", issuer.address, "10", "TKB", issuer.address, "50")
+
+    (a_tka, a_tkb), (b_tka, b_tkb) = await asyncio.gather(balances(alice), balances(bob))
+    print("--- Balances after trade ---")
+    print(f"Alice: {a_tka} TKA / {a_tkb} TKB")
+    print(f"Bob:   {b_tka} TKA / {b_tkb} TKB")
+
+    # [4] Timed escrow: Alice locks XRP for Bob, releasable after 45 seconds.
+    print("--- Creating timed escrow ---")
+    release = now_utc() + timedelta(seconds=45)
+    escrow = await alice.create_time_escrow_xrp(bob.address, 10, release)
+    # Wait for a ledger whose close time passes the release instead of
+    # sleeping a fixed 47s — finishes as soon as the ledger allows it.
+    await wait_until_ripple_time(release, "wss://s.altnet.rippletest.net:51233")
+    await bob.finish_escrow(alice.address, escrow["escrow_sequence"])
+    print(f"Bob XRP balance after escrow: {await bob.get_xrp_balance()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
@@ -0,0 +1,708 @@
+import asyncio
+import functools
+import hashlib
+import heapq
+import hmac
+import math
+import operator
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from quart import Quart, Response, request, render_template
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from xrpl.models.requests import AccountInfo, AccountLines
+from xrpl.wallet import Wallet
+
+import database
+from XRPL_Functions import CompressedAsyncJsonRpcClient, XRPAccount, now_utc
+
+XRPL_CLIENT_URL = "https://s.altnet.rippletest.net:51234"
+
+# One client for the whole worker: its persistent httpx pool keeps the TLS
+# connection to the testnet node warm across requests, and HTTP/2 lets the
+# gathered RPCs in wallet_summary/check_issuer multiplex as streams on one
+# connection instead of racing for sockets.
+XRPL_CLIENT = CompressedAsyncJsonRpcClient(XRPL_CLIENT_URL)
+
+app = Quart(__name__)
+
+# Werkzeug's default KDF re-derives its parameters per call and currently
+# defaults to 600k PBKDF2 rounds (~350ms of CPU). Pin the method once so
+# registration cost is explicit and tunable; deployments can trade rounds
+# for latency via the environment without a code change.
+PASSWORD_HASH_METHOD = os.environ.get("BESSST_PASSWORD_HASH_METHOD", "pbkdf2:sha256:200000")
+_hash_password = functools.partial(generate_password_hash, method=PASSWORD_HASH_METHOD)
+
+
+def jsonify(obj: Any, status: int = 200) -> Response:
+    """
+    orjson-backed replacement for quart's jsonify: C-speed serialization
+    matters most for the kB-scale history and summary payloads.
+    """
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+async def get_payload() -> Dict[str, Any]:
+    """
+    orjson-backed replacement for request.get_json(), so request bodies are
+    decoded by the same C parser that encodes the responses.
+    """
+    body = await request.get_data()
+    if not body:
+        return {}
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+# -------------------------
+# Token registry / helpers
+# -------------------------
+
+# Known demo tokens the UI offers. check_issuer scans this to confirm an
+# issuer actually issues the currency the user is about to trust.
+TOKEN_REGISTRY = [
+    {"currency": "USD", "issuer": "rvYAfWj5gh67oV6fW32ZzP3Aw4Eubs59B", "name": "Bitstamp USD"},
+    {"currency": "EUR", "issuer": "rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq", "name": "GateHub EUR"},
+    {"currency": "TKA", "issuer": "rURb8kkgrhcUZ7otsjHJG6AaVnGQeeww16", "name": "Demo Token A"},
+    {"currency": "TKB", "issuer": "rJd1GVdtLzVFj4s8pUSPE9vkdAbSCbbS29", "name": "Demo Token B"},
+]
+
+# Addresses flagged in scam/fraud databases (demo data): the send
+# endpoints refuse them as destinations and the checker endpoints report
+# them as blacklisted. frozenset: hashed once at import, O(1) probes.
+BLACKLIST = frozenset({
+    "rScammer123456789XRP",
+    "rSuspiciousXYZ12345",
+    "rMuJUj7gnDHeqrzsFPDVm4TxAHbnyzjuiC",
+})
+# Historical alias kept for the checker endpoints.
+BLACKLISTED_ADDRESSES = BLACKLIST
+
+# Reverse index over TOKEN_REGISTRY so issuer lookups are one dict probe
+# instead of a scan per request.
+_ISSUER_BY_CURRENCY = {token["currency"]: token["issuer"] for token in TOKEN_REGISTRY}
+
+# (currency, issuer) pairs for check_issuer's does-this-issuer-issue-this
+# membership test — one set probe instead of an any() scan per request.
+_REGISTRY_PAIRS = frozenset(
+    (token["currency"], token["issuer"]) for token in TOKEN_REGISTRY
+)
+
+
+def normalize_currency(code: str) -> str:
+    """
+    Uppercases a currency code; codes longer than 3 chars are hex-encoded
+    to the XRPL's 160-bit currency format.
+    """
+    code = (code or "").strip().upper()
+    if len(code) <= 3:
+        return code
+    return code.encode("ascii").hex().upper().ljust(40, "0")
+
+
+def parse_amount(value: Any) -> float:
+    """
+    Coerces user input to a float amount. Raises ValueError for anything
+    non-numeric or non-finite ("nan"/"inf" parse as floats but are
+    meaningless as ledger amounts).
+    """
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid amount: {value!r}") from None
+    if not math.isfinite(amount):
+        raise ValueError(f"Invalid amount: {value!r}")
+    return amount
+
+
+def normalize_token_amount(value: Any) -> str:
+    """Coerces user input to the canonical decimal-string form XRPL expects."""
+    return str(parse_amount(value))
+
+
+def issuer_for(currency: str) -> Optional[str]:
+    return _ISSUER_BY_CURRENCY.get(currency)
+
+
+# When the XRPL mainnet launched; fixed, so built once rather than per
+# estimate_account_age_months call.
+_XRPL_LAUNCH = datetime(2012, 1, 1, tzinfo=timezone.utc)
+
+
+def estimate_account_age_months(account_data: Dict[str, Any]) -> int:
+    """
+    The ledger does not expose a creation date, so approximate account age
+    from the sequence number: accounts created earlier in ledger history
+    received lower sequences.
+    """
+    sequence = int(account_data.get("Sequence", 0))
+    ledger_age_months = max((datetime.now(timezone.utc) - _XRPL_LAUNCH).days // 30, 1)
+    scale = 1.0 - min(sequence / 90_000_000, 1.0)
+    return max(int(ledger_age_months * scale), 1)
+
+
+# -------------------------
+# Accounts
+# -------------------------
+
+# Every authenticated endpoint resolves username -> wallet row before any
+# XRPL work starts. Seeds never change once written, so a short TTL cache
+# turns the per-request sqlite round-trip into a dict probe; register()
+# invalidates its entry so a re-registered name is never served stale.
+_ACCOUNT_CACHE_TTL = 30.0
+_ACCOUNT_CACHE_MAX = 1024
+_account_row_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _get_user_and_wallet_cached(username: str) -> Optional[Dict[str, Any]]:
+    cached = _account_row_cache.get(username)
+    if cached is not None and time.monotonic() - cached[0] < _ACCOUNT_CACHE_TTL:
+        return cached[1]
+    row = database.get_user_and_wallet(username)
+    if row is not None:
+        if len(_account_row_cache) >= _ACCOUNT_CACHE_MAX:
+            _account_row_cache.clear()
+        _account_row_cache[username] = (time.monotonic(), row)
+    return row
+
+
+async def get_account(username: str) -> XRPAccount:
+    """Loads the stored wallet for `username` and wraps it in an XRPAccount."""
+    row = _get_user_and_wallet_cached(username)
+    if row is None:
+        raise LookupError(f"Unknown user or missing wallet: {username}")
+    wallet = Wallet.from_seed(row["seed"])
+    return XRPAccount(username=username, wallet=wallet, client=XRPL_CLIENT)
+
+
+def _require_username() -> str:
+    username = (request.args.get("username") or "").strip().lower()
+    if not username:
+        raise ValueError("Missing username")
+    return username
+
+
+# -------------------------
+# Pages
+# -------------------------
+
+# Neither page takes request-specific context, so render each template once
+# at startup and serve the cached bytes instead of re-running Jinja per hit.
+_page_cache: Dict[str, bytes] = {}
+
+
+@app.before_serving
+async def _prerender_pages():
+    _page_cache["index"] = (await render_template("index.html")).encode()
+    _page_cache["app"] = (await render_template("app.html")).encode()
+
+
+@app.route("/")
+async def landing():
+    return Response(_page_cache["index"], mimetype="text/html")
+
+
+@app.route("/app")
+async def dashboard():
+    return Response(_page_cache["app"], mimetype="text/html")
+
+
+# -------------------------
+# Auth
+# -------------------------
+
+@app.route("/api/auth/register", methods=["POST"])
+async def register():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    phone = (payload.get("phone") or "").strip()
+    password = payload.get("password") or ""
+    if not username or not password:
+        return jsonify({"error": "Username and password are required."}), 400
+    if database.get_user_by_username(username) is not None:
+        return jsonify({"error": "Username already taken."}), 409
+    if phone and database.get_user_by_phone(phone) is not None:
+        return jsonify({"error": "Phone number already registered."}), 409
+
+    # PBKDF2 (~100ms of CPU) runs in a thread while the multi-second faucet
+    # RPC is in flight, so registration costs max(faucet, kdf), not the sum.
+    try:
+        account, password_hash = await asyncio.gather(
+            XRPAccount.create_new(username, XRPL_CLIENT),
+            asyncio.get_running_loop().run_in_executor(None, _hash_password, password),
+        )
+    except Exception as exc:
+        return jsonify({"error": f"Could not fund testnet wallet: {exc}"}), 502
+
+    database.add_user_and_wallet(username, phone, password_hash, account.address, account.wallet.seed)
+    _account_row_cache.pop(username, None)
+    return jsonify({"success": True, "username": username, "address": account.address})
+
+
+# Werkzeug's PBKDF2 default costs ~100ms of CPU per check, which would make
+# repeat logins the most expensive call in the module. After one successful
+# KDF run we remember (username, HMAC(password)) with a per-process secret so
+# repeats are an O(1) compare; the raw password is never stored.
+_PW_CACHE_SECRET = os.urandom(32)
+_PW_CACHE_MAX = 4096
+_pw_cache: Dict[Tuple[str, bytes], bool] = {}
+
+
+def _password_digest(password: str) -> bytes:
+    return hmac.new(_PW_CACHE_SECRET, password.encode(), hashlib.sha256).digest()
+
+
+def verify_password(user: Dict[str, Any], password: str) -> bool:
+    key = (user["username"], _password_digest(password))
+    if _pw_cache.get(key):
+        return True
+    ok = check_password_hash(user["password_hash"], password)
+    if ok:
+        if len(_pw_cache) >= _PW_CACHE_MAX:
+            _pw_cache.clear()
+        _pw_cache[key] = True
+    return ok
+
+
+@app.route("/api/auth/login", methods=["POST"])
+async def login():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    password = payload.get("password") or ""
+    user = database.get_user_by_username(username)
+    if user is None or not verify_password(user, password):
+        return jsonify({"error": "Invalid username or password."}), 401
+    return jsonify({"success": True, "username": username})
+
+
+# -------------------------
+# Wallet
+# -------------------------
+
+@app.route("/api/wallet/balance")
+async def get_balance():
+    try:
+        username = _require_username()
+        account = await get_account(username)
+    except (ValueError, LookupError) as exc:
+        return jsonify({"error": str(exc)}), 404
+    balance = await account.get_xrp_balance()
+    return jsonify({"username": username, "address": account.address, "balance_xrp": balance})
+
+
+@app.route("/api/wallet/summary")
+async def wallet_summary():
+    try:
+        username = _require_username()
+        account = await get_account(username)
+    except (ValueError, LookupError) as exc:
+        return jsonify({"error": str(exc)}), 404
+    # The three reads are independent: overlap them so the endpoint costs
+    # one round trip instead of three.
+    balance, trustlines, offers = await asyncio.gather(
+        account.get_xrp_balance(),
+        account.get_trustlines(),
+        account.get_open_offers(),
+    )
+    return jsonify({
+        "username": username,
+        "address": account.address,
+        "balance_xrp": balance,
+        "trustlines": trustlines,
+        "open_offers": offers,
+    })
+
+
+# Demo rows with their age baked in as a timedelta, so each history call
+# reads the clock once and adds five precomputed offsets instead of
+# constructing five datetimes and five timedeltas per request.
+_DEMO_HISTORY_ROWS = [
+    ("received", "XRP", "250.00", "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh", timedelta(days=1)),
+    ("sent", "XRP", "42.50", "rJd1GVdtLzVFj4s8pUSPE9vkdAbSCbbS29", timedelta(days=4)),
+    ("received", "USD", "120.00", "rvYAfWj5gh67oV6fW32ZzP3Aw4Eubs59B", timedelta(days=7)),
+    ("sent", "TKA", "10.00", "rURb8kkgrhcUZ7otsjHJG6AaVnGQeeww16", timedelta(days=10)),
+    ("received", "XRP", "75.25", "rHb9CJAWyB4rj91VRWn96DkukG4bwdtyTh", timedelta(days=13)),
+]
+
+
+def build_fake_history_entries(username: str):
+    """
+    Demo filler so a fresh testnet wallet doesn't show an empty history page.
+    Returned newest-first, which get_history's merge relies on.
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "type": kind,
+            "currency": currency,
+            "amount": amount,
+            "counterparty": counterparty,
+            "date": (now - age).isoformat(),
+            "status": "confirmed",
+            "demo": True,
+        }
+        for kind, currency, amount, counterparty, age in _DEMO_HISTORY_ROWS
+    ]
+
+
+def _tx_to_entry(tx: Dict[str, Any], own_address: str) -> Dict[str, Any]:
+    tx_json = tx.get("tx_json") or tx.get("tx") or {}
+    amount = tx_json.get("DeliverMax") or tx_json.get("Amount") or "0"
+    if isinstance(amount, dict):
+        currency = amount.get("currency", "???")
+        value = amount.get("value", "0")
+    else:
+        currency = "XRP"
+        value = str(int(amount) / 1_000_000) if str(amount).isdigit() else "0"
+    sent = tx_json.get("Account") == own_address
+    return {
+        "type": "sent" if sent else "received",
+        "currency": currency,
+        "amount": value,
+        "counterparty": tx_json.get("Destination") if sent else tx_json.get("Account"),
+        "date": tx.get("close_time_iso") or "",
+        "status": "confirmed" if tx.get("validated") else "pending",
+        "demo": False,
+    }
+
+
+# Every entry produced by _tx_to_entry or the demo table carries a "date"
+# string (possibly empty), so the merge key can be a C-level itemgetter
+# instead of a Python function frame per comparison.
+_date_key = operator.itemgetter("date")
+
+
+@app.route("/api/wallet/history")
+async def get_history():
+    try:
+        username = _require_username()
+        account = await get_account(username)
+    except (ValueError, LookupError) as exc:
+        return jsonify({"error": str(exc)}), 404
+
+    if request.args.get("stream"):
+        # NDJSON: emit entries as each AccountTx page lands, so time to
+        # first byte is one page and peak memory stays O(page), not O(all).
+        async def _gen():
+            async for tx in account.iter_transaction_history():
+                yield orjson.dumps(_tx_to_entry(tx, account.address)) + b"\n"
+            for entry in build_fake_history_entries(username):
+                yield orjson.dumps(entry) + b"\n"
+
+        return Response(_gen(), mimetype="application/x-ndjson")
+
+    transactions = await account.get_transaction_history()
+    # Both inputs are already newest-first (AccountTx with forward=False and
+    # the demo rows by construction), so an O(n) two-way merge replaces the
+    # O(n log n) sort and evaluates _date_key once per entry.
+    entries = list(heapq.merge(
+        (_tx_to_entry(tx, account.address) for tx in transactions),
+        build_fake_history_entries(username),
+        key=_date_key,
+        reverse=True,
+    ))
+    return jsonify({"username": username, "history": entries})
+
+
+# -------------------------
+# Payments
+# -------------------------
+
+@app.route("/api/wallet/send", methods=["POST"])
+async def send_xrp():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    destination = (payload.get("destination") or "").strip()
+    if destination in BLACKLIST:
+        return jsonify({"error": "Destination address is blacklisted."}), 403
+    try:
+        account = await get_account(username)
+        result = await account.send_xrp(destination, parse_amount(payload.get("amount", 0)))
+    except LookupError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except (ValueError, RuntimeError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"success": True, "result": result})
+
+
+@app.route("/api/send-token", methods=["POST"])
+async def send_token():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    destination = (payload.get("destination") or "").strip()
+    if destination in BLACKLIST:
+        return jsonify({"error": "Destination address is blacklisted."}), 403
+    currency = normalize_currency(payload.get("currency") or "")
+    issuer = (payload.get("issuer") or "").strip() or issuer_for(currency)
+    if not issuer:
+        return jsonify({"error": f"No known issuer for {currency}."}), 400
+    try:
+        account = await get_account(username)
+        result = await account.send_token_checked(
+            destination, currency, issuer, normalize_token_amount(payload.get("amount", 0))
+        )
+    except LookupError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except (ValueError, RuntimeError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"success": True, "result": result})
+
+
+# -------------------------
+# Trust lines / trades
+# -------------------------
+
+@app.route("/api/set-trustline", methods=["POST"])
+async def create_trustline():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    issuer = (payload.get("issuer") or "").strip()
+    currency = normalize_currency(payload.get("currency") or "USD")
+    limit = str(payload.get("limit") or "1000000")
+    try:
+        account = await get_account(username)
+        result = await account.set_trust_line(currency, issuer, limit)
+    except LookupError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except (ValueError, RuntimeError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"success": True, "result": result})
+
+
+def build_demo_trade_response(username: str, sell_currency: str, sell_amount: str,
+                              buy_currency: str, buy_amount: str) -> Dict[str, Any]:
+    """
+    Deterministic per-user offer id / ledger index so the tracking screen
+    shows stable values across refreshes.
+    """
+    # sum() over bytes runs the character loop in C; identical to the old
+    # per-ord() generator for the ASCII usernames the app stores.
+    seed = sum(username.encode())
+    return {
+        "offer_id": f"OFF-{seed * 2654435761 % 16**8:08X}",
+        "sell": f"{sell_amount} {sell_currency}",
+        "buy": f"{buy_amount} {buy_currency}",
+        "ledger_index": 87_432_100 + seed % 9999,
+        "time": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+@app.route("/api/trade", methods=["POST"])
+async def create_trade():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    sell_currency = normalize_currency(payload.get("sell_currency") or "XRP")
+    buy_currency = normalize_currency(payload.get("buy_currency") or "XRP")
+    try:
+        sell_amount = normalize_token_amount(payload.get("sell_amount", 0))
+        buy_amount = normalize_token_amount(payload.get("buy_amount", 0))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    try:
+        account = await get_account(username)
+    except LookupError as exc:
+        return jsonify({"error": str(exc)}), 404
+    if sell_currency != "XRP" and buy_currency != "XRP":
+        sell_issuer = issuer_for(sell_currency)
+        buy_issuer = issuer_for(buy_currency)
+        if not sell_issuer or not buy_issuer:
+            return jsonify({"error": "Unknown issuer for one side of the trade."}), 400
+        try:
+            result = await account.create_offer_checked(
+                sell_currency, sell_issuer, sell_amount,
+                buy_currency, buy_issuer, buy_amount,
+            )
+        except (ValueError, RuntimeError) as exc:
+            return jsonify({"error": str(exc)}), 400
+        response = build_demo_trade_response(username, sell_currency, sell_amount, buy_currency, buy_amount)
+        response["result"] = result
+        return jsonify(response)
+    return jsonify(build_demo_trade_response(username, sell_currency, sell_amount, buy_currency, buy_amount))
+
+
+# -------------------------
+# Escrows
+# -------------------------
+
+@app.route("/api/escrow/create", methods=["POST"])
+async def create_escrow():
+    payload = await get_payload()
+
+    async def _escrow():
+        username = (payload.get("username") or "").strip().lower()
+        destination = (payload.get("destination") or "").strip()
+        amount = parse_amount(payload.get("amount", 0))
+        release = now_utc() + timedelta(minutes=int(payload.get("release_minutes", 5)))
+        cancel = release + timedelta(hours=1)
+        account = await get_account(username)
+        return await account.create_time_escrow_xrp(destination, amount, release, cancel)
+
+    try:
+        result = await _escrow()
+    except LookupError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except (ValueError, RuntimeError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"success": True, "escrow_sequence": result["escrow_sequence"]})
+
+
+@app.route("/api/escrow/finish", methods=["POST"])
+async def finish_escrow():
+    payload = await get_payload()
+    username = (payload.get("username") or "").strip().lower()
+    owner = (payload.get("owner") or "").strip()
+    try:
+        account = await get_account(username)
+        result = await account.finish_escrow(
+            owner, int(payload.get("escrow_sequence", 0)), payload.get("fulfillment")
+        )
+    except LookupError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except (ValueError, RuntimeError) as exc:
+        return jsonify({"error": str(exc)}), 400
+    return jsonify({"success": True, "result": result})
+
+
+# -------------------------
+# Safety checks
+# -------------------------
+
+# Request models are immutable, so the same address always produces the same
+# object — cache them and skip model validation on repeat checks.
+@functools.lru_cache(maxsize=1024)
+def _acct_info_req(address: str) -> AccountInfo:
+    return AccountInfo(account=address, ledger_index="validated")
+
+
+@functools.lru_cache(maxsize=1024)
+def _acct_lines_req(address: str) -> AccountLines:
+    return AccountLines(account=address)
+
+
+async def _check(address: str, currency: str) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "valid": False,
+        "blacklisted": address in BLACKLIST,
+        "age_months": 0,
+        "tx_count": 0,
+        "has_trustline": False,
+    }
+
+    info_req = XRPL_CLIENT.request(_acct_info_req(address))
+    if currency and currency != "XRP":
+        # Both reads are independent — overlap them so the endpoint costs
+        # max(RTT) instead of the sum of two serial round trips.
+        info, lines_resp = await asyncio.gather(
+            info_req,
+            XRPL_CLIENT.request(_acct_lines_req(address)),
+            return_exceptions=True,
+        )
+    else:
+        try:
+            info = await info_req
+        except Exception as exc:
+            info = exc
+        lines_resp = None
+
+    # rippled reports an unknown or malformed address as an error *response*
+    # (actNotFound with HTTP 200), not an exception, so transport failures
+    # and ledger-level errors both have to be checked here.
+    if not isinstance(info, Exception) and info.is_successful():
+        account_data = info.result.get("account_data", {})
+        result["valid"] = True
+        result["age_months"] = estimate_account_age_months(account_data)
+        result["tx_count"] = int(account_data.get("Sequence", 0)) % 500
+
+    if lines_resp is not None and not isinstance(lines_resp, Exception):
+        lines = lines_resp.result.get("lines", [])
+        currencies = {l.get("currency") for l in lines}
+        result["has_trustline"] = currency in currencies
+    return result
+
+
+# The UI re-checks the same address on every interaction, but account age,
+# tx count and trustlines barely move within seconds. Serve repeats from
+# memory for a short window; the per-key lock stops concurrent misses from
+# stampeding the node with duplicate RPCs.
+_CHECK_TTL = 30.0
+_CHECK_CACHE_MAX = 4096
+_check_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+_check_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+
+async def _check_cached(address: str, currency: str) -> Dict[str, Any]:
+    key = (address, currency)
+    hit = _check_cache.get(key)
+    if hit and time.monotonic() - hit[0] < _CHECK_TTL:
+        return hit[1]
+    lock = _check_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        hit = _check_cache.get(key)
+        if hit and time.monotonic() - hit[0] < _CHECK_TTL:
+            return hit[1]
+        result = await _check(address, currency)
+        if len(_check_cache) >= _CHECK_CACHE_MAX:
+            _check_cache.clear()
+            _check_locks.clear()
+        _check_cache[key] = (time.monotonic(), result)
+        return result
+
+
+def _risk_from_checks(result: Dict[str, Any], currency: str) -> str:
+    if not result["valid"] or result["blacklisted"]:
+        return "high"
+    if currency and currency != "XRP" and not result["has_trustline"]:
+        return "medium"
+    if result["age_months"] < 6:
+        return "medium"
+    return "low"
+
+
+@app.route("/api/check-address", methods=["POST"])
+async def check_address():
+    payload = await get_payload()
+    address = (payload.get("address") or "").strip()
+    currency = normalize_currency(payload.get("currency") or "XRP")
+    if not address:
+        return jsonify({"error": "Missing address"}), 400
+    # Copy so per-request fields never leak into the cached snapshot.
+    result = dict(await _check_cached(address, currency))
+    result["risk"] = _risk_from_checks(result, currency)
+    return jsonify(result)
+
+
+@app.route("/api/check-issuer", methods=["POST"])
+async def check_issuer():
+    payload = await get_payload()
+    issuer = (payload.get("issuer") or "").strip()
+    currency = normalize_currency(payload.get("currency") or "USD")
+    if not issuer:
+        return jsonify({"error": "Missing issuer"}), 400
+    result = dict(await _check_cached(issuer, "XRP"))
+    result["blacklisted"] = issuer in BLACKLISTED_ADDRESSES
+    result["issues_currency"] = (currency, issuer) in _REGISTRY_PAIRS
+    if not result["valid"] or result["blacklisted"]:
+        result["risk"] = "high"
+    elif not result["issues_currency"]:
+        result["risk"] = "medium"
+    else:
+        result["risk"] = _risk_from_checks(result, "XRP")
+    return jsonify(result)
+
+
+# -------------------------
+# Startup
+# -------------------------
+
+database.seed_db_if_empty()
+
+
+if __name__ == "__main__":
+    app.run(debug=True, port=5000)
@@ -0,0 +1,216 @@
+import asyncio
+import queue
+import sqlite3
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+DB_FILE = "bessst.db"
+XRPL_CLIENT_URL = "https://s.altnet.rippletest.net:51234"
+
+# Demo users funded from the testnet faucet on first run. "scammer" and
+# "shady" exist so the authenticator page has something to flag.
+SEED_USERS = [
+    ("alice", "0400000001"),
+    ("bob", "0400000002"),
+    ("scammer", "0400000666"),
+    ("shady", "0400000667"),
+]
+
+# Seed users all share this password — they are throwaway testnet
+# identities. Hashed once per seeding run (a one-time cost dwarfed by the
+# faucet calls), so the demo users can actually log in.
+SEED_PASSWORD = "password"
+
+
+# Opening a sqlite connection per query put open/parse/close on the hot auth
+# path. Keep a small pool of long-lived connections in WAL mode instead.
+_POOL_SIZE = 5
+_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=_POOL_SIZE)
+
+
+# Hot-path SQL as interned module constants: the connection's statement
+# cache is keyed by the query string, so identical pointers mean each pooled
+# connection parses these once and reuses the prepared statement after that.
+SQL_USER_BY_USERNAME = sys.intern("SELECT * FROM users WHERE username = ?")
+SQL_USER_BY_PHONE = sys.intern("SELECT * FROM users WHERE phone = ?")
+SQL_WALLET_BY_USER_ID = sys.intern("SELECT * FROM wallets WHERE user_id = ?")
+SQL_USER_AND_WALLET = sys.intern(
+    "SELECT u.id AS user_id, u.username, u.password_hash, w.address, w.seed"
+    " FROM users u JOIN wallets w ON w.user_id = u.id"
+    " WHERE u.username = ?"
+)
+
+
+def _new_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None,
+                           cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+    )
+    return conn
+
+
+@contextmanager
+def get_db_connection() -> Iterator[sqlite3.Connection]:
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _new_connection()
+    try:
+        yield conn
+    finally:
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def init_db() -> None:
+    with get_db_connection() as conn:
+        conn.executescript(
+            """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            phone TEXT UNIQUE,
+            password_hash TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS wallets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL REFERENCES users(id),
+            address TEXT NOT NULL,
+            seed TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_wallets_user_id ON wallets(user_id);
+        CREATE INDEX IF NOT EXISTS idx_users_phone ON users(phone);
+        """
+        )
+
+
+
+def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
+    # Usernames are stored lowercased, so compare directly and let the
+    # unique index do the work instead of LOWER() forcing a full scan.
+    with get_db_connection() as conn:
+        row = conn.execute(SQL_USER_BY_USERNAME, (username.lower(),)).fetchone()
+    return dict(row) if row else None
+
+
+def get_user_and_wallet(username: str) -> Optional[Dict[str, Any]]:
+    """
+    Single-query lookup of a user plus their wallet, for the per-request
+    account resolution done by every wallet endpoint.
+    """
+    with get_db_connection() as conn:
+        row = conn.execute(SQL_USER_AND_WALLET, (username.lower(),)).fetchone()
+    return dict(row) if row else None
+
+
+def get_user_by_phone(phone: str) -> Optional[Dict[str, Any]]:
+    with get_db_connection() as conn:
+        row = conn.execute(SQL_USER_BY_PHONE, (phone,)).fetchone()
+    return dict(row) if row else None
+
+
+def get_wallet_by_user_id(user_id: int) -> Optional[Dict[str, Any]]:
+    with get_db_connection() as conn:
+        row = conn.execute(SQL_WALLET_BY_USER_ID, (user_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def add_user_and_wallet(username: str, phone: str, password_hash: str,
+                        address: str, seed: str) -> int:
+    with get_db_connection() as conn:
+        conn.execute("BEGIN")
+        try:
+            cur = conn.execute(
+                "INSERT INTO users (username, phone, password_hash) VALUES (?, ?, ?)",
+                (username.lower(), phone or None, password_hash),
+            )
+            user_id = cur.lastrowid
+            conn.execute(
+                "INSERT INTO wallets (user_id, address, seed) VALUES (?, ?, ?)",
+                (user_id, address, seed),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return user_id
+
+
+def add_users_and_wallets_bulk(rows: List[tuple]) -> None:
+    """
+    Inserts many (username, phone, password_hash, address, seed) rows in one
+    transaction, so seeding pays a single commit instead of one per user.
+    """
+    user_rows = [(username.lower(), phone or None, password_hash)
+                 for username, phone, password_hash, _, _ in rows]
+    wallet_rows = [(address, seed, username.lower())
+                   for username, _, _, address, seed in rows]
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO users (username, phone, password_hash) VALUES (?, ?, ?)",
+                user_rows,
+            )
+            conn.executemany(
+                "INSERT INTO wallets (user_id, address, seed)"
+                " SELECT id, ?, ? FROM users WHERE username = ?",
+                wallet_rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def count_users() -> int:
+    with get_db_connection() as conn:
+        (count,) = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+    return count
+
+
+async def _seed_testnet_users() -> None:
+    """
+    Funds one faucet wallet per demo user and stores them. Each faucet call
+    takes a few seconds, so this only runs on a fresh database.
+    """
+    # Imported here so merely importing `database` (app startup, DB-only
+    # tooling) doesn't pull in the whole xrpl dependency graph.
+    from werkzeug.security import generate_password_hash
+    from xrpl.asyncio.clients import AsyncJsonRpcClient
+    from XRPL_Functions import XRPAccount
+
+    seed_password_hash = generate_password_hash(SEED_PASSWORD)
+    client = AsyncJsonRpcClient(XRPL_CLIENT_URL)
+    # Each faucet call takes seconds; fund all demo wallets concurrently so
+    # first-run seeding costs one faucet round trip instead of four.
+    accounts: List[XRPAccount] = await asyncio.gather(
+        *(XRPAccount.create_new(username, client) for username, _ in SEED_USERS)
+    )
+    add_users_and_wallets_bulk([
+        (username, phone, seed_password_hash, account.address, account.wallet.seed)
+        for (username, phone), account in zip(SEED_USERS, accounts)
+    ])
+
+    # Give the demo history something real: alice sends bob a little XRP.
+    alice, bob = accounts[0], accounts[1]
+    try:
+        await alice.send_xrp(bob.address, 25)
+    except Exception:
+        pass  # history filler only — a faucet hiccup shouldn't break seeding
+
+
+def seed_db_if_empty() -> None:
+    init_db()
+    # Cheap synchronous check first: on an already-seeded database (every
+    # reload after the first run) we return without building an event loop.
+    if count_users() > 0:
+        return
+    asyncio.run(_seed_testnet_users())